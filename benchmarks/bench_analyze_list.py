@@ -0,0 +1,106 @@
+"""
+Benchmark analyze_list against the original multi-pass implementation.
+
+Counts how many times each version iterates over the input list and how
+long it takes.
+
+Usage (with numcore installed, e.g. `pip install -e .`):
+    python benchmarks/bench_analyze_list.py [size]
+"""
+import random
+import sys
+import time
+
+from numcore import analyze_list
+
+
+class CountingList(list):
+    """List that counts how many times it is iterated over."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.passes = 0
+
+    def __iter__(self):
+        self.passes += 1
+        return super().__iter__()
+
+
+def legacy_analyze_list(lst):
+    """The original analyze_list, kept here as the baseline."""
+    def counter(lst):
+        item_count = {}
+        for item in lst:
+            if item in item_count:
+                item_count[item] += 1
+            else:
+                item_count[item] = 1
+        return item_count
+
+    def mean(lst):
+        return sum(lst) / len(lst)
+
+    def median(lst):
+        sorted_list = sorted(lst)
+        n = len(lst)
+        if n % 2 == 1:
+            return sorted_list[n // 2]
+        return (sorted_list[n // 2 - 1] + sorted_list[n // 2]) / 2
+
+    def mode(lst):
+        data = counter(lst)
+        mode_counter = max(data.values())
+        return [name for name, amount in data.items() if amount == mode_counter]
+
+    def variance(lst, sample=False):
+        m = mean(lst)
+        n = len(lst) - 1 if sample else len(lst)
+        return sum((x - m) ** 2 for x in lst) / n
+
+    def std(lst, sample=False):
+        return variance(lst, sample) ** 0.5
+
+    return {
+        'count': len(lst),
+        'sum': sum(lst),
+        'min': min(lst),
+        'max': max(lst),
+        'mean': mean(lst),
+        'median': median(lst),
+        'mode': mode(lst),
+        'range': max(lst) - min(lst),
+        'variance': {
+            'population variance': variance(lst),
+            'sample variance': variance(lst, True)
+        },
+        'std': {
+            'population std': std(lst),
+            'sample std': std(lst, True)
+        },
+        'unique_count': len(set(lst)),
+        'frequency': counter(lst)
+    }
+
+
+def run(func, data):
+    lst = CountingList(data)
+    start = time.perf_counter()
+    func(lst)
+    elapsed = time.perf_counter() - start
+    return lst.passes, elapsed
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    random.seed(0)
+    data = [random.randint(0, 10_000) for _ in range(size)]
+
+    print(f"analyze_list on {size} integers")
+    print(f"{'version':<10}{'passes':>8}{'seconds':>12}")
+    for name, func in (("legacy", legacy_analyze_list), ("current", analyze_list)):
+        passes, elapsed = run(func, data)
+        print(f"{name:<10}{passes:>8}{elapsed:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
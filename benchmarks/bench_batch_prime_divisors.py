@@ -0,0 +1,51 @@
+"""
+Benchmark batch_prime_divisors: the pure-Python loop, the NumPy path
+returning lists, and the NumPy path returning flat (primes, offsets)
+arrays.
+
+Usage (with numcore installed, e.g. `pip install -e .`; NumPy optional):
+    python benchmarks/bench_batch_prime_divisors.py
+"""
+import random
+import time
+
+import numcore.Library as library
+from numcore import batch_prime_divisors
+
+SIZE = 1_000_000
+LIMIT = 10**6
+
+
+def best_of(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = random.Random(1)
+    nums = [rng.randrange(2, LIMIT) for _ in range(SIZE)]
+    batch_prime_divisors(nums[:10])  # build the shared table once
+
+    numpy = library._np
+    library._np = None
+    try:
+        pure = best_of(lambda: batch_prime_divisors(nums))
+    finally:
+        library._np = numpy
+    print(f"{'pure Python, lists':<26}{SIZE / pure / 1e6:>8.2f} M/s")
+    if numpy is None:
+        print("NumPy not installed; vectorized paths skipped")
+        return
+    arr = numpy.array(nums)
+    lists = best_of(lambda: batch_prime_divisors(arr))
+    flat = best_of(lambda: batch_prime_divisors(arr, output='numpy'))
+    print(f"{'NumPy, lists':<26}{SIZE / lists / 1e6:>8.2f} M/s")
+    print(f"{'NumPy, (primes, offsets)':<26}{SIZE / flat / 1e6:>8.2f} M/s")
+
+
+if __name__ == "__main__":
+    main()
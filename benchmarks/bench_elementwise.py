@@ -0,0 +1,73 @@
+"""
+Benchmark chained element-wise matrix operations against out= and the
+fused matrix_eval evaluator.
+
+Evaluates 2*A + 3*B - C on size x size matrices (default 2000) three ways:
+chained calls that allocate an intermediate per operation, the same chain
+written into one preallocated matrix with out=, and a single matrix_eval
+pass. Peak traced memory (from a separate run) is reported next to the
+time.
+
+Usage (with numcore installed, e.g. `pip install -e .`):
+    python benchmarks/bench_elementwise.py [size]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from numcore import (Matrix, create_matrix, matrix_add, matrix_eval,
+                     matrix_sub, scalar_multiply)
+
+
+def chained(A, B, C):
+    return matrix_sub(matrix_add(scalar_multiply(A, 2), scalar_multiply(B, 3)), C)
+
+
+def with_out(A, B, C):
+    out = scalar_multiply(A, 2)
+    matrix_add(out, scalar_multiply(B, 3), out=out)
+    return matrix_sub(out, C, out=out)
+
+
+def fused(A, B, C):
+    return matrix_eval("2*A + 3*B - C", A=A, B=B, C=C)
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    # Memory is traced in a separate run; tracing slows allocation down.
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    random.seed(0)
+
+    def make():
+        return [[random.random() for _ in range(size)] for _ in range(size)]
+
+    lists = (make(), make(), make())
+    matrices = tuple(Matrix(m) for m in lists)
+
+    print(f"2*A + 3*B - C on {size}x{size} matrices")
+    print(f"{'operands':<10}{'method':<10}{'seconds':>10}{'peak MiB':>12}")
+    for kind, operands in (("list", lists), ("Matrix", matrices)):
+        expected = None
+        for name, func in (("chained", chained), ("out=", with_out), ("fused", fused)):
+            result, elapsed, peak = measure(func, *operands)
+            rows = result.tolist() if isinstance(result, Matrix) else result
+            if expected is None:
+                expected = rows
+            assert rows == expected, f"{name} result differs"
+            print(f"{kind:<10}{name:<10}{elapsed:>10.3f}{peak / 2**20:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
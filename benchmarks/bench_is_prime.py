@@ -0,0 +1,60 @@
+"""
+Benchmark is_prime against the original trial-division implementation.
+
+The original is only timed on inputs it can finish in reasonable time;
+larger inputs are reported for the current implementation alone.
+
+Usage (with numcore installed, e.g. `pip install -e .`):
+    python benchmarks/bench_is_prime.py
+"""
+import time
+
+from numcore import is_prime
+
+
+def legacy_is_prime(num):
+    """The original is_prime, kept here as the baseline."""
+    if num < 2:
+        return False
+    if num == 2 or num == 3:
+        return True
+    for i in range(2, int(num**0.5) + 1):
+        if num % i == 0:
+            return False
+    return True
+
+
+CASES = [
+    ("6-digit prime", 999983, True),
+    ("9-digit prime", 999999937, True),
+    ("12-digit prime", 999999999989, True),
+    ("12-digit semiprime", 999983 * 1000003, True),
+    ("18-digit prime", 999999999999999989, False),
+    ("2**89 - 1", 2**89 - 1, False),
+    ("2**521 - 1", 2**521 - 1, False),
+]
+
+
+def best_of(func, arg, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'input':<22}{'legacy (s)':>14}{'current (s)':>14}")
+    for name, num, run_legacy in CASES:
+        current = best_of(is_prime, num)
+        if run_legacy:
+            assert legacy_is_prime(num) == is_prime(num)
+            legacy = f"{best_of(legacy_is_prime, num, repeat=1):>14.6f}"
+        else:
+            legacy = f"{'skipped':>14}"
+        print(f"{name:<22}{legacy}{current:>14.6f}")
+
+
+if __name__ == "__main__":
+    main()
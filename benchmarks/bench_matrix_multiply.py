@@ -0,0 +1,86 @@
+"""
+Benchmark matrix_multiply against the original i-j-k triple loop.
+
+Times square integer and float matrices of sizes 16 to 1024. The original
+loop is only run up to --legacy-max (default 256) because it takes minutes
+beyond that; the pure Python backend is run up to --python-max (default
+512). The NumPy backend, if installed, is timed at every size.
+
+Usage (with numcore installed, e.g. `pip install -e .`):
+    python benchmarks/bench_matrix_multiply.py [--legacy-max N] [--python-max N]
+"""
+import argparse
+import random
+import time
+
+from numcore import matrix_multiply
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+SIZES = (16, 32, 64, 128, 256, 512, 1024)
+
+
+def legacy_matrix_multiply(mat1, mat2):
+    """The original matrix_multiply, kept here as the baseline."""
+    rows1, cols1 = len(mat1), len(mat1[0])
+    cols2 = len(mat2[0])
+    result = [[0] * cols2 for _ in range(rows1)]
+    for i in range(rows1):
+        for j in range(cols2):
+            for k in range(cols1):
+                result[i][j] += mat1[i][k] * mat2[k][j]
+    return result
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--legacy-max", type=int, default=256)
+    parser.add_argument("--python-max", type=int, default=512)
+    args = parser.parse_args()
+
+    random.seed(0)
+    print(f"{'size':>6}{'kind':>7}{'legacy (s)':>13}{'python (s)':>13}{'numpy (s)':>13}")
+    for size in SIZES:
+        for kind, gen in (("int", lambda: random.randint(-100, 100)),
+                          ("float", random.random)):
+            a = [[gen() for _ in range(size)] for _ in range(size)]
+            b = [[gen() for _ in range(size)] for _ in range(size)]
+            cells = []
+
+            legacy = None
+            if size <= args.legacy_max:
+                legacy, elapsed = timed(legacy_matrix_multiply, a, b)
+                cells.append(f"{elapsed:>13.4f}")
+            else:
+                cells.append(f"{'-':>13}")
+
+            if size <= args.python_max:
+                result, elapsed = timed(matrix_multiply, a, b, backend="python")
+                if legacy is not None:
+                    assert result == legacy, "python backend differs from legacy"
+                cells.append(f"{elapsed:>13.4f}")
+            else:
+                cells.append(f"{'-':>13}")
+
+            if numpy is not None:
+                result, elapsed = timed(matrix_multiply, a, b, backend="numpy")
+                if legacy is not None and kind == "int":
+                    assert result == legacy, "numpy backend differs from legacy"
+                cells.append(f"{elapsed:>13.4f}")
+            else:
+                cells.append(f"{'n/a':>13}")
+
+            print(f"{size:>6}{kind:>7}" + "".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark the process-pool backend against the serial pure Python one.
+
+Times matrix_multiply(..., backend='parallel') on square float matrices
+and batch_determinant on a batch of small integer matrices, for the given
+worker count (default os.cpu_count()).
+
+Usage (with numcore installed, e.g. `pip install -e .`):
+    python benchmarks/bench_parallel.py [--workers N]
+"""
+import argparse
+import os
+import random
+import time
+
+from numcore import batch_determinant, determinant, matrix_multiply, set_parallel
+
+SIZES = (128, 256, 512)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    set_parallel(workers=args.workers, threshold=0)
+
+    random.seed(0)
+    print(f"{args.workers} workers")
+    print(f"{'job':<24}{'serial (s)':>13}{'parallel (s)':>14}")
+    for size in SIZES:
+        a = [[random.random() for _ in range(size)] for _ in range(size)]
+        serial, t_serial = timed(matrix_multiply, a, a, backend="python")
+        parallel, t_parallel = timed(matrix_multiply, a, a, backend="parallel")
+        assert serial == parallel
+        print(f"{f'multiply {size}x{size}':<24}{t_serial:>13.4f}{t_parallel:>14.4f}")
+
+    batch = [[[random.randint(-50, 50) for _ in range(12)] for _ in range(12)]
+             for _ in range(2000)]
+    serial, t_serial = timed(lambda: [determinant(m) for m in batch])
+    parallel, t_parallel = timed(batch_determinant, batch)
+    assert serial == parallel
+    print(f"{'2000 dets of 12x12':<24}{t_serial:>13.4f}{t_parallel:>14.4f}")
+
+
+if __name__ == "__main__":
+    main()